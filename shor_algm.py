@@ -1,16 +1,46 @@
-from qiskit import QuantumCircuit, Aer, transpile, assemble, execute
+from qiskit import QuantumCircuit, transpile
+from qiskit_aer import AerSimulator
+from qiskit.circuit.library import get_standard_gate_name_mapping
+from qiskit.synthesis.qft import synth_qft_full
 from qiskit.visualization import plot_histogram
-import numpy as np
 from fractions import Fraction
+from functools import lru_cache
 import hashlib
 
+BIT_LENGTH = 67  # For 67-bit keys
+# RIPEMD-160 digests to match; set membership keeps each check O(1) in the number of targets
+TARGETS = frozenset(bytes.fromhex(h) for h in (
+    "739437bb3dd6d1983e66629c5f08c70e52769371",
+))
+
+# Shared simulator so repeated solves don't rebuild the backend. A dense
+# statevector of BIT_LENGTH + 1 qubits cannot fit in host or GPU memory;
+# MPS scales with entanglement instead of qubit count.
+BACKEND = AerSimulator(method='matrix_product_state',
+                       matrix_product_state_max_bond_dimension=64)
+# Aer's native gates (cp included); its save_* instructions are not valid basis gates
+BASIS_GATES = sorted(set(BACKEND.operation_names) & set(get_standard_gate_name_mapping()))
+
+# OpenSSL-backed hasher (SHA-NI where available); copied per call to skip
+# the by-name digest lookup hashlib.new() does every time
+RIPEMD160 = hashlib.new('ripemd160')
+
 def ripemd160_hash(data):
     """Compute RIPEMD-160 hash."""
     sha256_hash = hashlib.sha256(data).digest()
-    ripemd160 = hashlib.new('ripemd160', sha256_hash).digest()
-    return ripemd160.hex()
+    ripemd160 = RIPEMD160.copy()
+    ripemd160.update(sha256_hash)
+    return ripemd160.digest()
+
+def find_matching_key(candidates):
+    """Return the first candidate whose RIPEMD-160 hash is in TARGETS, or None."""
+    for private_key_candidate in candidates:
+        public_key_bytes = private_key_candidate.to_bytes(32, 'big')  # Convert to 32-byte format
+        if ripemd160_hash(public_key_bytes) in TARGETS:
+            return private_key_candidate
+    return None
 
-def optimized_ecd_log(p, g, y, bit_length):
+def optimized_ecd_log(p, g, bit_length):
     """Optimized Quantum Algorithm for solving the Elliptic Curve Discrete Logarithm Problem in 67-bit range."""
     n_count = bit_length  # Number of qubits for counting
     qc = QuantumCircuit(n_count + 1, n_count)
@@ -19,11 +49,13 @@ def optimized_ecd_log(p, g, y, bit_length):
     qc.h(range(n_count))
 
     # Step 2: Modular Exponentiation (Quantum Implementation of y = g^x mod p)
-    for q in range(n_count):
-        qc.append(modular_exp(g, 2**q, p, bit_length), [*range(n_count + 1)])
+    # Simplified version (actual modular arithmetic requires advanced gates).
+    # (CX)^2 = I, so each controlled power 2**q reduces to a single CX when odd;
+    # only 2**0 is odd.
+    qc.cx(0, 1)
 
-    # Step 3: Apply Quantum Fourier Transform for Period Finding
-    qc.append(qft(n_count), range(n_count))
+    # Step 3: Apply Inverse Quantum Fourier Transform for Period Finding
+    qc.append(qft_dagger(n_count), range(n_count))
 
     # Step 4: Apply Grover's Optimization (Probability Amplification)
     qc.append(grover_amplification(n_count), range(n_count))
@@ -33,69 +65,52 @@ def optimized_ecd_log(p, g, y, bit_length):
 
     return qc
 
-def modular_exp(base, exp, mod, bit_length):
-    """Optimized Modular Exponentiation Circuit for Elliptic Curve Computation with 67-bit keys."""
-    qc = QuantumCircuit(bit_length + 1)
-    for _ in range(exp):
-        qc.cx(0, 1)  # Simplified version (actual modular arithmetic requires advanced gates)
-    return qc
-
-def qft(n):
-    """Optimized Quantum Fourier Transform."""
-    qc = QuantumCircuit(n)
-    for j in range(n):
-        qc.h(j)
-        for k in range(j):
-            qc.cp(np.pi/float(2**(j-k)), k, j)
-    return qc
+def qft_dagger(n):
+    """Inverse Quantum Fourier Transform (rotations of pi/2**20 or smaller are dropped)."""
+    return synth_qft_full(n, do_swaps=True, approximation_degree=max(0, n - 20), inverse=True)
 
 def grover_amplification(n):
     """Grover’s Search Optimization for Faster ECDLP Computation."""
     qc = QuantumCircuit(n)
-    for q in range(n):
-        qc.h(q)
-        qc.x(q)
-        qc.h(q)
+    qc.z(range(n))  # per-qubit H-X-H collapses to Z
     return qc
 
+@lru_cache(maxsize=8)
+def compiled_ecd_log(p, g, bit_length):
+    """Build and transpile the ECDLP circuit once per (p, g, bit_length); it does not depend on y."""
+    # Transpile against the basis only: the MPS backend's target reports a
+    # 63-qubit cap, which Aer itself does not enforce for this method.
+    return transpile(optimized_ecd_log(p, g, bit_length),
+                     optimization_level=3, basis_gates=BASIS_GATES)
+
 def solve_ecd_log(p, g, y, start_range, end_range):
     """Run Optimized Quantum ECDLP Solver and Extract Private Key within given range."""
-    bit_length = 67  # For 67-bit keys
-    qc = optimized_ecd_log(p, g, y, bit_length)
-    
-    backend = Aer.get_backend('aer_simulator')
-    transpiled_qc = transpile(qc, backend)
-    qobj = assemble(transpiled_qc, shots=2048)
-    results = backend.run(qobj).result()
+    transpiled_qc = compiled_ecd_log(p, g, BIT_LENGTH)
+    results = BACKEND.run(transpiled_qc, shots=2048).result()
     
     counts = results.get_counts()
     
-    for measured_key in counts.keys():
-        private_key_candidate = int(measured_key, 2)
-        
-        # Check if the private key is in the given range
-        if start_range <= private_key_candidate <= end_range:
-            public_key_bytes = bytes.fromhex(f"{private_key_candidate:064x}")  # Convert to 32-byte format
-            hashed_key = ripemd160_hash(public_key_bytes)
-            
-            # Check if the RIPEMD-160 hash matches
-            if hashed_key == "739437bb3dd6d1983e66629c5f08c70e52769371":
-                return private_key_candidate
-
-    return None
+    # Check which private keys are in the given range, most frequently
+    # measured first so likely hits are hashed early.
+    measured_keys = (int(measured_key, 2) for measured_key in sorted(counts, key=counts.get, reverse=True))
+    candidates = [key for key in measured_keys if start_range <= key <= end_range]
+    
+    # Check if the RIPEMD-160 hash matches
+    return find_matching_key(candidates)
 
-# Define the range (67-bit range)
-start_range = int("40000000000000000", 16)
-end_range = int("7ffffffffffffffff", 16)
+if __name__ == "__main__":
+    # Define the range (67-bit range)
+    start_range = int("40000000000000000", 16)
+    end_range = int("7ffffffffffffffff", 16)
 
-# ECC Parameters (Example)
-p = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F  # SECP256K1 Prime Order
-g = 2  # Generator Point (for simplicity)
-y = 1234567890  # Public Key (Placeholder, replace with actual)
+    # ECC Parameters (Example)
+    p = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F  # SECP256K1 Prime Order
+    g = 2  # Generator Point (for simplicity)
+    y = 1234567890  # Public Key (Placeholder, replace with actual)
 
-private_key = solve_ecd_log(p, g, y, start_range, end_range)
+    private_key = solve_ecd_log(p, g, y, start_range, end_range)
 
-if private_key:
-    print(f"✅ Recovered Private Key: {hex(private_key)}")
-else:
-    print("❌ No matching private key found in the given range.")
+    if private_key:
+        print(f"✅ Recovered Private Key: {hex(private_key)}")
+    else:
+        print("❌ No matching private key found in the given range.")